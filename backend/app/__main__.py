@@ -0,0 +1,30 @@
+"""
+Entrypoint for running the THALE backend with a tuned uvicorn stack.
+
+Run with: python -m app
+
+Pins the fast event loop (uvloop) and C HTTP/WebSocket protocol parsers
+explicitly instead of relying on uvicorn's auto-detection, and raises the
+keep-alive timeout to suit long-running streaming/summarization requests.
+"""
+
+import uvicorn
+
+from .config import get_settings
+
+
+def main() -> None:
+    settings = get_settings()
+    uvicorn.run(
+        "app.main:app",
+        host=settings.api_host,
+        port=settings.api_port,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        timeout_keep_alive=75,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,9 @@ Application configuration loaded from environment variables.
 """
 
 import os
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import FrozenSet
 
 
 class Settings(BaseSettings):
@@ -29,20 +29,27 @@ class Settings(BaseSettings):
     whisper_model_id: str = "NbAiLab/nb-whisper-large"
     whisper_language: str = "no"
     whisper_chunk_length_s: int = 30
+    whisper_batch_size: int = 8
+    preload_whisper: bool = False
+
+    # Streaming
+    max_stream_connections: int = 4
+    max_stream_connections_per_ip: int = 2
     
     # Bedrock
     bedrock_model_id: str = "eu.anthropic.claude-sonnet-4-5-20250929-v1:0"
     bedrock_max_tokens: int = 2000
+    bedrock_max_concurrency: int = 10
     
     # File Upload
     max_upload_size_mb: int = 500
     allowed_audio_extensions: str = ".m4a,.wav,.mp3,.aac,.flac,.ogg,.webm"
     recordings_dir: str = "./backend/recordings"
     
-    @property
-    def allowed_extensions_list(self) -> List[str]:
-        """Return allowed extensions as a list."""
-        return [ext.strip() for ext in self.allowed_audio_extensions.split(",")]
+    @cached_property
+    def allowed_extensions_set(self) -> FrozenSet[str]:
+        """Return allowed extensions as a frozenset, parsed once (request-hot)."""
+        return frozenset(ext.strip().lower() for ext in self.allowed_audio_extensions.split(","))
     
     @property
     def max_upload_size_bytes(self) -> int:
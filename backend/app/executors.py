@@ -0,0 +1,18 @@
+"""
+Shared executor for blocking file I/O offloaded from the event loop.
+
+asyncio.to_thread() uses the loop's default executor, which is sized
+min(32, cpu+4) and shared with everything else — under concurrent uploads
+that spawns far more threads than the disk can usefully serve. All file
+I/O offloads go through this one bounded pool instead, so the thread
+count under load stays predictable. Whisper inference keeps the default
+executor: it releases the GIL and must not queue behind file copies.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+IO_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 4) * 2),
+    thread_name_prefix="thale-io",
+)
@@ -3,13 +3,17 @@ THALE Backend - FastAPI Application Entry Point
 Speech-to-Text Transcription Service for Fremtind Forsikring
 """
 
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
+from . import __version__
 from .config import get_settings
 from .models import HealthResponse
 from .routers import transcription, summarization, streaming
@@ -24,44 +28,98 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+async def _deferred_init(app: FastAPI):
+    """
+    Run the heavy startup work (AWS credential check, Whisper preload) after
+    the server has bound its port, so orchestrator liveness probes see the
+    socket open immediately.
+    """
+    app.state.gpu_available = False
+    try:
+        # Pre-load services to trigger environmental checks
+        try:
+            from .services import get_bedrock_service
+            # This will trigger AWS credential check
+            get_bedrock_service()
+        except Exception as e:
+            logger.warning("Could not initialize Bedrock service on startup: %s", e)
+
+        # Pre-load the Whisper model so the first request/WebSocket doesn't pay
+        # the multi-GB load cost. Gated on PRELOAD_WHISPER so dev reload stays cheap.
+        whisper = app.state.whisper
+        if settings.preload_whisper:
+            logger.info("   Preloading Whisper model...")
+            await asyncio.get_event_loop().run_in_executor(None, whisper.load_model)
+
+        # Cache GPU availability once so health checks never import torch
+        # on the request path (the first import costs hundreds of ms).
+        try:
+            import torch
+            app.state.gpu_available = torch.cuda.is_available()
+        except ImportError:
+            pass  # torch not installed yet
+
+        logger.info("✅ Deferred initialization complete")
+    except Exception:
+        # An unexpected failure (e.g. torch raising OSError on a broken CUDA
+        # install) must not kill this task silently and pin /api/health at
+        # 503 forever. Log loudly and come up degraded: transcription falls
+        # back to lazy model loading, which reports its own errors.
+        logger.exception("Deferred initialization failed; serving in degraded mode")
+
+    app.state.ready = True
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown events."""
     # Startup
     logger.info("🚀 Starting THALE Backend...")
-    logger.info(f"   Environment: {settings.app_env}")
-    logger.info(f"   Whisper Model: {settings.whisper_model_id}")
-    logger.info(f"   Frontend URL: {settings.frontend_url}")
-    
+    logger.info("   Environment: %s", settings.app_env)
+    logger.info("   Whisper Model: %s", settings.whisper_model_id)
+    logger.info("   Frontend URL: %s", settings.frontend_url)
+
     # Create recordings directory if it doesn't exist
     from pathlib import Path
     recordings_path = Path(settings.recordings_dir)
     recordings_path.mkdir(parents=True, exist_ok=True)
-    logger.info(f"   Recordings Dir: {recordings_path.absolute()}")
-    
-    # Pre-load services to trigger environmental checks
-    try:
-        from .services import get_bedrock_service
-        # This will trigger AWS credential check
-        get_bedrock_service()
-    except Exception as e:
-        logger.warning(f"Could not initialize Bedrock service on startup: {e}")
-
-    # TODO: Pre-load Whisper model here for faster first request
-    # This is done in lifespan to avoid blocking startup
-    
+    logger.info("   Recordings Dir: %s", recordings_path.absolute())
+
+    from .services import get_whisper_service
+    app.state.whisper = get_whisper_service()
+    app.state.ready = False
+
+    # Defer the slow init (network RTT + model load) so the port binds fast;
+    # /api/health reports 503 until this task flips app.state.ready.
+    init_task = asyncio.create_task(_deferred_init(app))
+
     yield
-    
+
     # Shutdown
+    init_task.cancel()
+    from .executors import IO_EXECUTOR
+    IO_EXECUTOR.shutdown(wait=False, cancel_futures=True)
     logger.info("👋 Shutting down THALE Backend...")
 
 
+class _GZipExceptSSEMiddleware(GZipMiddleware):
+    """GZip middleware that leaves SSE endpoints uncompressed (gzip buffers
+    the stream, which would delay progress events)."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/upload/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="THALE API",
     description="Speech-to-Text Transcription Service for Fremtind Forsikring",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -74,6 +132,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large text responses (long transcripts, Claude summaries)
+app.add_middleware(_GZipExceptSSEMiddleware, minimum_size=1024, compresslevel=6)
+
 # Include routers
 app.include_router(transcription.router, prefix="/api/transcription", tags=["transcription"])
 app.include_router(streaming.router, prefix="/api/streaming", tags=["streaming"])
@@ -91,32 +152,27 @@ async def root():
     }
 
 
-@app.get("/api/health", response_model=HealthResponse, tags=["health"])
-async def health_check():
-    """Health check endpoint for monitoring."""
-    from . import __version__
-    
-    # Check GPU availability (gracefully handle missing torch)
-    gpu_available = False
-    try:
-        import torch
-        gpu_available = torch.cuda.is_available()
-    except ImportError:
-        pass  # torch not installed yet
-    
-    # Check model status
-    model_loaded = False
-    try:
-        from .services import get_whisper_service
-        whisper = get_whisper_service()
-        model_loaded = whisper.is_loaded
-    except Exception:
-        pass
+@app.get("/api/health/live", tags=["health"])
+async def liveness_check():
+    """Liveness probe: returns 200 as soon as the socket is bound."""
+    return {"status": "alive"}
 
+
+@app.get("/api/health", response_model=HealthResponse, tags=["health"])
+async def health_check(request: Request):
+    """Health check endpoint for monitoring. Returns 503 until deferred init finishes."""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "detail": "Service is initializing"},
+        )
+
+    # GPU availability and the Whisper handle are cached on app.state during
+    # deferred init, so this is a pure dict build with no imports.
     return HealthResponse(
         status="ok",
         version=__version__,
-        gpu_available=gpu_available,
-        model_loaded=model_loaded,
-        timestamp=datetime.utcnow(),
+        gpu_available=request.app.state.gpu_available,
+        model_loaded=request.app.state.whisper.is_loaded,
+        timestamp=datetime.now(timezone.utc),
     )
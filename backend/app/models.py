@@ -2,11 +2,15 @@
 Pydantic models for API request/response schemas.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from enum import Enum
 from datetime import datetime
 
+# Shared config for the hot-path models (built per progress event / per
+# response): skip default validation and reject unknown fields outright
+_FAST_CONFIG = ConfigDict(extra="forbid", validate_default=False)
+
 
 class TranscriptionStatus(str, Enum):
     """Status of a transcription job."""
@@ -24,6 +28,8 @@ class TranscriptionRequest(BaseModel):
 
 class TranscriptionProgress(BaseModel):
     """Progress update for ongoing transcription."""
+    model_config = _FAST_CONFIG
+
     status: TranscriptionStatus
     progress_percent: float = Field(ge=0, le=100)
     current_chunk: int = 0
@@ -34,6 +40,8 @@ class TranscriptionProgress(BaseModel):
 
 class TranscriptionResult(BaseModel):
     """Result of a completed transcription."""
+    model_config = _FAST_CONFIG
+
     id: str
     status: TranscriptionStatus
     text: str
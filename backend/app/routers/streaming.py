@@ -4,126 +4,255 @@ Handles real-time audio transcription via WebSockets.
 """
 
 import logging
-import os
-import tempfile
 import asyncio
-import json
+import time
+from collections import Counter, defaultdict
 from typing import Optional
 
+import numpy as np
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
-from ..services import get_whisper_service
+from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 4  # float32 PCM from ffmpeg
+
+# Connection caps: unbounded sockets let one client run Whisper constantly
+# and evict everyone else from the GPU. The decode semaphore serializes
+# transcription so concurrent sessions can't oversubscribe the device.
+_active_connections = 0
+_conns_per_ip = defaultdict(int)
+_decode_sem = asyncio.Semaphore(1)
+
+# Decode errors per exception type; a bare `except: pass` here used to hide
+# real regressions (GPU OOM, broken decoder pipe) from the logs entirely
+_decode_error_counts = Counter()
+
+
+async def _start_ffmpeg_decoder() -> asyncio.subprocess.Process:
+    """
+    Start a persistent ffmpeg process that decodes the incoming webm stream
+    (stdin) to 16 kHz mono float32 PCM (stdout).
+    """
+    return await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "f32le", "-ar", str(SAMPLE_RATE), "-ac", "1",
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+
+
+def _client_ip(websocket: WebSocket) -> str:
+    """
+    Resolve the real client address for the per-IP connection cap.
+
+    In the shipped deployment every browser reaches the backend through the
+    frontend nginx proxy, so the socket peer is the proxy for all clients and
+    keying on it would turn the per-IP cap into a global one. nginx forwards
+    the original address in X-Real-IP / X-Forwarded-For; prefer those.
+    """
+    real_ip = websocket.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip
+    forwarded = websocket.headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return websocket.client.host if websocket.client else "unknown"
+
+
+async def _drain_pcm(process: asyncio.subprocess.Process, pcm_buffer: bytearray) -> None:
+    """Read decoded PCM from ffmpeg stdout into the session buffer."""
+    while True:
+        data = await process.stdout.read(64 * 1024)
+        if not data:
+            break
+        pcm_buffer.extend(data)
+
 
 @router.websocket("/realtime")
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time transcription.
-    
+
     Protocol:
     1. Client connects
     2. Client sends audio chunks (binary, e.g., audio/webm)
-    3. Server appends chunks to a buffer
-    4. Server periodically transcribes the buffer and sends back text
-    5. Server sends JSON: {"text": "...", "is_final": false}
+    3. Server decodes chunks to PCM via a persistent ffmpeg pipe
+    4. Server periodically transcribes the tail of the buffer and sends back text
+    5. Server sends JSON: {"type": "transcription", "text": "...", "is_final": false}
+
+    Audio older than one Whisper window (~30s) is transcribed exactly once and
+    committed, so each partial decode only processes the most recent window
+    instead of re-transcribing the whole session (which was quadratic).
     """
+    global _active_connections
+    settings = get_settings()
+    client_ip = _client_ip(websocket)
+
+    # Reject over-cap connections with "try again later" instead of queueing
+    if (_active_connections >= settings.max_stream_connections
+            or _conns_per_ip[client_ip] >= settings.max_stream_connections_per_ip):
+        logger.warning("WebSocket rejected (connection cap): %s", client_ip)
+        await websocket.close(code=1013)
+        return
+
     await websocket.accept()
+    _active_connections += 1
+    _conns_per_ip[client_ip] += 1
     logger.info("WebSocket connected")
-    
-    # Create a temp file to store the audio stream
-    # We use a temp file because ffmpeg (via librosa/soundfile) handles file formats better than raw bytes
-    fd, temp_path = tempfile.mkstemp(suffix=".webm")
-    os.close(fd)
-    
+
+    ffmpeg: Optional[asyncio.subprocess.Process] = None
+    drain_task: Optional[asyncio.Task] = None
+
     try:
-        whisper = get_whisper_service()
-        
-        # Ensure model is loaded (this might take time on first connection)
+        # Model is normally preloaded in the app lifespan (PRELOAD_WHISPER=1);
+        # fall back to loading here for dev setups that skip the preload.
+        whisper = websocket.app.state.whisper
         if not whisper.is_loaded:
             await websocket.send_json({"status": "loading_model", "message": "Loading Whisper model..."})
-            # Run load in executor to not block
-            try:
-                await asyncio.get_event_loop().run_in_executor(None, whisper.load_model)
-                
-                # Check if load was successful
-                if not whisper.is_loaded:
-                    await websocket.send_json({
-                        "status": "error",
-                        "message": "Whisper-modellen kunne ikke lastes. Live transkripsjon er ikke tilgjengelig. Sjå server-logger for detaljer."
-                    })
-                    await websocket.close()
-                    return
-                    
-                await websocket.send_json({"status": "ready", "message": "Model loaded"})
-            except Exception as e:
-                logger.error(f"Failed to load model in websocket: {e}")
+            await asyncio.get_event_loop().run_in_executor(None, whisper.load_model)
+
+            if not whisper.is_loaded:
                 await websocket.send_json({
                     "status": "error",
-                    "message": "Kunne ikke laste Whisper-modell. Live transkripsjon er ikke tilgjengelig."
+                    "message": "Whisper-modellen kunne ikke lastes. Live transkripsjon er ikke tilgjengelig. Sjå server-logger for detaljer."
                 })
                 await websocket.close()
                 return
-        
-        chunk_count = 0
-        TRANSCRIPTION_INTERVAL = 2  # Transcribe every 2 chunks (approx 2-3s) for faster subtitles
-        
-        while True:
-            # Receive audio chunk
-            # We expect binary data (audio blobs)
-            data = await websocket.receive_bytes()
-            
-            # Append to file
-            with open(temp_path, "ab") as f:
-                f.write(data)
-            
-            chunk_count += 1
-            
-            # Periodically transcribe
-            if chunk_count % TRANSCRIPTION_INTERVAL == 0:
-                # Run transcription in a separate thread to avoid blocking the WebSocket loop
-                # We use the existing transcribe_file method but suppress logging to avoid noise
+
+            await websocket.send_json({"status": "ready", "message": "Model loaded"})
+
+        window_bytes = settings.whisper_chunk_length_s * SAMPLE_RATE * BYTES_PER_SAMPLE
+
+        # Decoded PCM accumulates here. Committed audio is trimmed from the
+        # front after transcription, so the buffer only ever holds the
+        # uncommitted tail (~2 windows) — an unbounded buffer costs ~230 MB
+        # per connection-hour at 16 kHz float32.
+        ffmpeg = await _start_ffmpeg_decoder()
+        pcm_buffer = bytearray()
+        drain_task = asyncio.create_task(_drain_pcm(ffmpeg, pcm_buffer))
+
+        committed_text = ""
+
+        # Chunk size is chosen by the browser, so a per-N-chunks counter gives
+        # wildly varying wallclock intervals. Debounce on the monotonic clock
+        # instead: signal the worker at most every MIN_DECODE_INTERVAL seconds,
+        # and only once enough new audio has been decoded.
+        MIN_DECODE_INTERVAL = 1.5  # seconds between partial decodes
+        MIN_BUFFERED_BYTES = 10 * 1024
+
+        # Decouple ingest from decode: the receive loop only feeds the decoder
+        # and flips `dirty`; the worker transcribes whatever is buffered when
+        # it wakes up. If several chunks arrive during a decode, the signals
+        # coalesce into a single dirty flag and only the latest audio is
+        # decoded next — ingest never waits on the GPU.
+        dirty = asyncio.Event()
+
+        async def receive_loop():
+            last_signal = 0.0
+            while True:
+                # Receive audio chunk
+                # We expect binary data (audio blobs)
+                data = await websocket.receive_bytes()
+
+                # Feed the webm stream to the decoder
+                ffmpeg.stdin.write(data)
+                await ffmpeg.stdin.drain()
+
+                now = time.monotonic()
+                if (now - last_signal >= MIN_DECODE_INTERVAL
+                        and len(pcm_buffer) > MIN_BUFFERED_BYTES):
+                    last_signal = now
+                    dirty.set()
+
+        async def transcribe_loop():
+            nonlocal committed_text
+            while True:
+                await dirty.wait()
+                dirty.clear()
+
                 try:
-                    # We need to check if the file has valid audio data
-                    # librosa might fail if the chunk is too small or header is incomplete
-                    if os.path.getsize(temp_path) > 10 * 1024:  # > 10KB
-                        
-                        # Use transcribe_file but we need to be careful about concurrency
-                        # For this MVP, we re-transcribe the whole growing file
-                        # This provides better context correction but gets slower as file grows
-                        
-                        # Run in executor
-                        result = await whisper.transcribe_file(temp_path)
-                        
+                    # Audio that has slid out of the current window is final:
+                    # transcribe it once, append to the committed prefix, and
+                    # drop its bytes so the buffer never outgrows ~2 windows.
+                    while len(pcm_buffer) > 2 * window_bytes:
+                        window = _to_samples(pcm_buffer, 0, window_bytes)
+                        async with _decode_sem:
+                            result = await whisper.transcribe_array(window)
                         if result.text.strip():
-                            await websocket.send_json({
+                            committed_text = f"{committed_text} {result.text.strip()}".strip()
+                        del pcm_buffer[:window_bytes]
+
+                    # Partial decode of the uncommitted tail (at most ~2 windows)
+                    tail = _to_samples(pcm_buffer, 0, len(pcm_buffer))
+                    if len(tail) > SAMPLE_RATE // 2:  # skip near-empty tails (<0.5s)
+                        async with _decode_sem:
+                            result = await whisper.transcribe_array(tail)
+
+                        text = f"{committed_text} {result.text.strip()}".strip()
+                        if text:
+                            # orjson + send_text: these fire every couple of
+                            # seconds, so skip the stdlib json encoder
+                            await websocket.send_text(orjson.dumps({
                                 "type": "transcription",
-                                "text": result.text,
+                                "text": text,
                                 "is_final": False
-                            })
-                            
-                except Exception as e:
-                    # Log error but don't crash the connection
-                    # Common errors: "Input file is empty" or "Invalid data found"
-                    # logger.warning(f"Streaming transcription error: {e}")
-                    pass
-                    
+                            }).decode())
+
+                except (RuntimeError, OSError, ValueError) as e:
+                    # Count and log but don't crash the connection
+                    # Common errors: incomplete webm header before first keyframe
+                    error_type = type(e).__name__
+                    _decode_error_counts[error_type] += 1
+                    logger.warning(
+                        "Streaming decode error (%s, #%d this process): %s",
+                        error_type, _decode_error_counts[error_type], e
+                    )
+
+        recv_task = asyncio.create_task(receive_loop())
+        trans_task = asyncio.create_task(transcribe_loop())
+        try:
+            await asyncio.gather(recv_task, trans_task)
+        finally:
+            recv_task.cancel()
+            trans_task.cancel()
+
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         try:
             if websocket.client_state == WebSocketState.CONNECTED:
                 await websocket.close(code=1011)
         except:
             pass
     finally:
-        # Cleanup temp file
-        if os.path.exists(temp_path):
+        _active_connections -= 1
+        _conns_per_ip[client_ip] -= 1
+        if _conns_per_ip[client_ip] <= 0:
+            del _conns_per_ip[client_ip]
+
+        # Cleanup the decoder pipeline
+        if drain_task is not None:
+            drain_task.cancel()
+        if ffmpeg is not None and ffmpeg.returncode is None:
             try:
-                os.unlink(temp_path)
-            except:
+                ffmpeg.stdin.close()
+                ffmpeg.kill()
+            except ProcessLookupError:
                 pass
+
+
+def _to_samples(pcm_buffer: bytearray, start: int, end: int) -> np.ndarray:
+    """Slice the PCM byte buffer to a float32 waveform, truncating partial samples."""
+    end -= (end - start) % BYTES_PER_SAMPLE
+    return np.frombuffer(bytes(pcm_buffer[start:end]), dtype=np.float32)
@@ -3,7 +3,15 @@ Summarization API endpoints.
 Handles text summarization using AWS Bedrock (Claude).
 """
 
+import asyncio
+import hashlib
 import logging
+import re
+from collections import OrderedDict
+from functools import partial
+from typing import Optional
+
+import anyio.to_thread
 from fastapi import APIRouter, HTTPException
 
 from ..config import get_settings
@@ -11,7 +19,86 @@ from ..models import SummarizationRequest, SummarizationResult
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-settings = get_settings()
+
+# Word-count regex compiled once; counting matches avoids building the
+# throwaway list that str.split() allocates for large transcripts
+_WS_RE = re.compile(r"\S+")
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words without materializing a list."""
+    return sum(1 for _ in _WS_RE.finditer(text))
+
+
+# Small in-memory LRU so idempotent retries (frontend double-clicks) don't
+# re-bill Claude, plus in-flight tasks so concurrent duplicates share one call
+_SUMMARY_CACHE_MAX = 256
+_summary_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_inflight_summaries: dict = {}
+
+
+def _summary_cache_key(request: SummarizationRequest) -> tuple:
+    """
+    Cache key: hash the (potentially huge) text instead of storing it.
+
+    The text is whitespace-normalized first, so re-opened transcripts that
+    differ only in line breaks or trailing blanks (the common re-edit case)
+    still hit the cache instead of re-billing Claude.
+    """
+    normalized = " ".join(request.text.split())
+    text_hash = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+    return (text_hash, request.style, request.max_length, request.prompt)
+
+
+# Cap concurrent Bedrock invocations below the account quota so a burst of
+# distinct requests queues here instead of tripping Bedrock throttling
+_bedrock_sem: Optional[asyncio.Semaphore] = None
+
+
+def _get_bedrock_sem() -> asyncio.Semaphore:
+    global _bedrock_sem
+    if _bedrock_sem is None:
+        _bedrock_sem = asyncio.Semaphore(get_settings().bedrock_max_concurrency)
+    return _bedrock_sem
+
+
+async def _call_bedrock(bedrock, request: SummarizationRequest) -> str:
+    """Invoke the blocking Bedrock call on a worker thread, concurrency-capped."""
+    async with _get_bedrock_sem():
+        return await anyio.to_thread.run_sync(partial(
+            bedrock.summarize,
+            text=request.text,
+            style=request.style,
+            max_length=request.max_length,
+            prompt=request.prompt,
+        ))
+
+
+async def _summarize_coalesced(bedrock, request: SummarizationRequest) -> str:
+    """
+    Run the blocking Bedrock call on a worker thread, deduplicating both
+    completed (LRU cache) and concurrent in-flight identical requests.
+    """
+    cache_key = _summary_cache_key(request)
+
+    cached = _summary_cache.get(cache_key)
+    if cached is not None:
+        _summary_cache.move_to_end(cache_key)
+        return cached
+
+    task = _inflight_summaries.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_call_bedrock(bedrock, request))
+        _inflight_summaries[cache_key] = task
+        task.add_done_callback(lambda _: _inflight_summaries.pop(cache_key, None))
+
+    summary = await asyncio.shield(task)
+
+    _summary_cache[cache_key] = summary
+    while len(_summary_cache) > _SUMMARY_CACHE_MAX:
+        _summary_cache.popitem(last=False)
+
+    return summary
 
 
 @router.post("/", response_model=SummarizationResult)
@@ -24,8 +111,9 @@ async def summarize_text(request: SummarizationRequest):
     - bullet_points: Concise bullet point summary (Norwegian)
     - executive_summary: High-level executive summary (Norwegian)
     """
-    logger.info(f"📝 Summarization request: {len(request.text)} chars, style={request.style}")
-    
+    text_len = len(request.text)
+    logger.info("📝 Summarization request: %d chars, style=%s", text_len, request.style)
+
     try:
         from ..services import get_bedrock_service
         bedrock = get_bedrock_service()
@@ -36,18 +124,13 @@ async def summarize_text(request: SummarizationRequest):
                 detail="Summarization service not available. Check AWS configuration."
             )
         
-        # Generate summary
-        summary = bedrock.summarize(
-            text=request.text,
-            style=request.style,
-            max_length=request.max_length,
-            prompt=request.prompt,
-        )
+        # Generate summary off the event loop, deduplicating identical requests
+        summary = await _summarize_coalesced(bedrock, request)
         
-        original_word_count = len(request.text.split())
-        summary_word_count = len(summary.split())
+        original_word_count = _count_words(request.text)
+        summary_word_count = _count_words(summary)
         
-        logger.info(f"   Generated summary: {summary_word_count} words from {original_word_count} words")
+        logger.info("   Generated summary: %d words from %d words", summary_word_count, original_word_count)
         
         return SummarizationResult(
             summary=summary,
@@ -57,7 +140,7 @@ async def summarize_text(request: SummarizationRequest):
         )
         
     except ImportError as e:
-        logger.warning(f"Bedrock dependencies not available: {e}")
+        logger.warning("Bedrock dependencies not available: %s", e)
         raise HTTPException(
             status_code=503,
             detail="Summarization service not available. Check dependencies."
@@ -65,7 +148,7 @@ async def summarize_text(request: SummarizationRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Summarization failed: {e}")
+        logger.error("Summarization failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Summarization failed: {str(e)}"
@@ -81,7 +164,7 @@ async def summarization_status():
         
         return {
             "available": bedrock.is_available,
-            "model": settings.bedrock_model_id if bedrock.is_available else None,
+            "model": get_settings().bedrock_model_id if bedrock.is_available else None,
         }
     except Exception as e:
         return {
@@ -7,33 +7,217 @@ import logging
 import uuid
 import asyncio
 import os
-from datetime import datetime
+import tempfile
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, Form
-from fastapi.responses import FileResponse
+import orjson
+from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, Form, Request
+from fastapi.responses import FileResponse, Response
 from sse_starlette.sse import EventSourceResponse
 
 from ..config import get_settings
+from ..executors import IO_EXECUTOR
 from ..models import (
     TranscriptionResult,
-    TranscriptionProgress,
     TranscriptionStatus,
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-settings = get_settings()
+
+
+# Progress events share a fixed schema, so build the JSON from a template
+# instead of validating a TranscriptionProgress model per SSE frame
+_PROGRESS_TEMPLATE = (
+    '{{"status":"processing","progress_percent":{p:.1f},"current_chunk":{c},'
+    '"total_chunks":{t},"message":{m},"partial_text":{pt}}}'
+)
+
+
+def _progress_event(percent: float, current: int, total: int, message: str, partial_text: str = "") -> str:
+    """Render a progress SSE payload; orjson handles the string escaping."""
+    return _PROGRESS_TEMPLATE.format(
+        p=percent,
+        c=current,
+        t=total,
+        m=orjson.dumps(message).decode(),
+        pt=orjson.dumps(partial_text).decode(),
+    )
+
+
+_STARTING_EVENT = _progress_event(0, 0, 1, "Starting transcription...")
+
+
+# Magic-byte prefixes for the audio containers we accept. Sniffing a handful
+# of byte comparisons against the head of the first chunk is enough to tell
+# these formats apart — no libmagic signature engine needed.
+_AUDIO_MAGIC = (
+    (b"ID3", "audio/mpeg"),       # MP3 with ID3 tag
+    (b"RIFF", "audio/wav"),
+    (b"fLaC", "audio/flac"),
+    (b"OggS", "audio/ogg"),
+    (b"\x1a\x45\xdf\xa3", "audio/webm"),  # EBML (webm/mkv)
+)
+
+
+def sniff_audio(head: bytes) -> Optional[str]:
+    """Return the MIME type for a recognized audio signature, or None."""
+    for prefix, mime in _AUDIO_MAGIC:
+        if head.startswith(prefix):
+            return mime
+    # MPEG frame sync (11 set bits): covers every MP3 version/layer and ADTS
+    # AAC, rather than enumerating individual sync byte pairs and rejecting
+    # e.g. MPEG-1-with-CRC (\xff\xfa) or MPEG-2.5 (\xff\xe3) files.
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        return "audio/mpeg"
+    if head[4:8] == b"ftyp":  # M4A/AAC/MP4 (ISO-BMFF puts the brand at offset 4)
+        return "audio/mp4"
+    return None
+
+
+async def _spool_upload_to_disk(file: UploadFile) -> tuple:
+    """
+    Stream an upload to a temp file, enforcing the size cap as bytes flow.
+
+    `UploadFile.read()` is only nominally async — once the spool spills to
+    disk every read blocks on file I/O in the event loop thread. Run the
+    whole drain on a worker thread instead, so concurrent requests (and SSE
+    progress events) keep flowing during large uploads.
+
+    Returns (temp_path, total_bytes). Caller is responsible for unlinking.
+    """
+    settings = get_settings()
+    suffix = Path(file.filename).suffix.lower() if file.filename else ""
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        total = await asyncio.get_running_loop().run_in_executor(
+            IO_EXECUTOR,
+            _copy_validated_audio,
+            file.file,
+            Path(temp_path),
+            settings.max_upload_size_bytes,
+            settings.max_upload_size_mb,
+        )
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    return temp_path, total
+
+
+# Extension -> MIME for serving recordings; resolved once per response so
+# browsers get correct Range/seek behavior instead of a hard-coded webm type
+_MEDIA_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".webm": "audio/webm",
+    ".m4a": "audio/mp4",
+    ".ogg": "audio/ogg",
+    ".flac": "audio/flac",
+    ".aac": "audio/aac",
+}
+
+
+def _recording_response(request: Request, file_path: Path, download_name: Optional[str] = None) -> Response:
+    """Serve a recording with resolved media type plus caching headers.
+
+    FileResponse sets an mtime+size ETag but never compares If-None-Match,
+    so the 304 short-circuit for repeat playback lives here.
+    """
+    stat = file_path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"Cache-Control": "private, max-age=3600", "ETag": etag}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path=str(file_path),
+        media_type=_MEDIA_TYPES.get(file_path.suffix.lower(), "application/octet-stream"),
+        filename=download_name or file_path.name,
+        headers=headers,
+    )
+
+
+# recording_id -> filename index, so lookups don't readdir the whole
+# recordings directory. Backed by an append-only JSONL sidecar; a null
+# filename entry is a deletion tombstone.
+_recording_index: Optional[dict] = None
+
+
+def _recording_index_file(recordings_path: Path) -> Path:
+    return recordings_path / "_index.jsonl"
+
+
+def _load_recording_index(recordings_path: Path) -> dict:
+    """Load (once) and return the recording_id -> filename index."""
+    global _recording_index
+    if _recording_index is None:
+        index = {}
+        index_file = _recording_index_file(recordings_path)
+        if index_file.exists():
+            with open(index_file, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = orjson.loads(line)
+                    if entry["filename"] is None:
+                        index.pop(entry["recording_id"], None)
+                    else:
+                        index[entry["recording_id"]] = entry["filename"]
+        _recording_index = index
+    return _recording_index
+
+
+def _index_recording(recordings_path: Path, recording_id: str, filename: Optional[str]) -> None:
+    """Record (or tombstone, if filename is None) a recording in the index."""
+    index = _load_recording_index(recordings_path)
+    if filename is None:
+        index.pop(recording_id, None)
+    else:
+        index[recording_id] = filename
+    with open(_recording_index_file(recordings_path), "ab") as f:
+        f.write(orjson.dumps({"recording_id": recording_id, "filename": filename}) + b"\n")
+
+
+def _copy_validated_audio(src, dst_path: Path, max_bytes: int, max_mb: int) -> int:
+    """
+    Copy an already-parsed upload into dst_path with a 4 MiB buffer,
+    sniffing the first chunk and enforcing the size cap as bytes flow.
+
+    Blocking by design — run it on IO_EXECUTOR so neither the spool read
+    nor the destination write stalls the event loop.
+    """
+    total = 0
+    with open(dst_path, "wb") as out:
+        while chunk := src.read(1 << 22):
+            if total == 0 and sniff_audio(chunk[:512]) is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="File content not recognized as a supported audio format"
+                )
+            total += len(chunk)
+            if total > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size: {max_mb}MB"
+                )
+            out.write(chunk)
+    return total
 
 
 def validate_audio_file(file: UploadFile) -> None:
     """Validate uploaded audio file."""
+    settings = get_settings()
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     
     ext = Path(file.filename).suffix.lower()
-    if ext not in settings.allowed_extensions_list:
+    if ext not in settings.allowed_extensions_set:
         raise HTTPException(
             status_code=400,
             detail=f"File type '{ext}' not allowed. Allowed types: {settings.allowed_audio_extensions}"
@@ -56,31 +240,25 @@ async def transcribe_audio(
     """
     validate_audio_file(file)
     
-    transcription_id = str(uuid.uuid4())
-    start_time = datetime.utcnow()
-    
-    logger.info(f"📤 Received file: {file.filename} (ID: {transcription_id})")
-    
-    # Read file content
-    content = await file.read()
-    file_size_mb = len(content) / (1024 * 1024)
-    logger.info(f"   File size: {file_size_mb:.2f} MB")
-    
-    # Check file size
-    if len(content) > settings.max_upload_size_bytes:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size: {settings.max_upload_size_mb}MB"
-        )
+    transcription_id = uuid.uuid4().hex
+    t0 = time.monotonic()
+    created_at = datetime.now(timezone.utc)
     
+    logger.info("📤 Received file: %s (ID: %s)", file.filename, transcription_id)
+
+    # Stream the upload to disk (enforces the size cap chunk by chunk)
+    temp_path, total_bytes = await _spool_upload_to_disk(file)
+    file_size_mb = total_bytes / (1024 * 1024)
+    logger.info("   File size: %.2f MB", file_size_mb)
+
     try:
         # Get the Whisper service and transcribe
         from ..services import get_whisper_service
         whisper = get_whisper_service()
-        
-        result = await whisper.transcribe_bytes(content)
-        
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+
+        result = await whisper.transcribe_file(temp_path)
+
+        processing_time = time.monotonic() - t0
         
         return TranscriptionResult(
             id=transcription_id,
@@ -89,22 +267,25 @@ async def transcribe_audio(
             duration_seconds=result.duration_seconds,
             word_count=result.word_count,
             processing_time_seconds=processing_time,
-            created_at=start_time,
+            created_at=created_at,
         )
         
     except ImportError as e:
         # ML dependencies not installed
-        logger.warning(f"ML dependencies not available: {e}")
+        logger.warning("ML dependencies not available: %s", e)
         raise HTTPException(
             status_code=503,
             detail="Transcription service not available. ML dependencies may not be installed."
         )
     except Exception as e:
-        logger.error(f"Transcription failed: {e}")
+        logger.error("Transcription failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Transcription failed: {str(e)}"
         )
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
 
 
 @router.post("/upload/stream")
@@ -119,104 +300,116 @@ async def transcribe_audio_stream(
     """
     validate_audio_file(file)
     
-    transcription_id = str(uuid.uuid4())
-    start_time = datetime.utcnow()
+    transcription_id = uuid.uuid4().hex
+    t0 = time.monotonic()
+    created_at = datetime.now(timezone.utc)
     
-    logger.info(f"📤 Received file for streaming: {file.filename} (ID: {transcription_id})")
-    
-    content = await file.read()
-    file_size_mb = len(content) / (1024 * 1024)
-    logger.info(f"   File size: {file_size_mb:.2f} MB")
-    
-    # Check file size
-    if len(content) > settings.max_upload_size_bytes:
-        async def error_generator():
-            yield {
-                "event": "error",
-                "data": f"File too large. Maximum size: {settings.max_upload_size_mb}MB"
-            }
-        return EventSourceResponse(error_generator())
-    
-    progress_updates = []
-    
-    def on_progress(progress):
-        """Callback for progress updates."""
-        progress_updates.append(progress)
+    logger.info("📤 Received file for streaming: %s (ID: %s)", file.filename, transcription_id)
     
+    # Stream the upload to disk (enforces the size cap chunk by chunk)
+    temp_path, total_bytes = await _spool_upload_to_disk(file)
+    file_size_mb = total_bytes / (1024 * 1024)
+    logger.info("   File size: %.2f MB", file_size_mb)
+
     async def generate_events():
         """Generate SSE events for transcription progress."""
         try:
             from ..services import get_whisper_service
             whisper = get_whisper_service()
-            
-            # Create a queue for progress updates
-            queue = asyncio.Queue()
+
+            # Bounded queue: a slow SSE client must not grow server memory.
+            # Progress is idempotent (last one wins), so overflow drops the
+            # oldest event instead of blocking the transcription thread.
+            queue = asyncio.Queue(maxsize=32)
             loop = asyncio.get_running_loop()
-            
+
+            def _enqueue(progress):
+                try:
+                    queue.put_nowait(progress)
+                except asyncio.QueueFull:
+                    try:
+                        queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        pass
+                    queue.put_nowait(progress)
+
             def on_progress(progress):
                 """Callback for progress updates (called from thread)."""
-                loop.call_soon_threadsafe(queue.put_nowait, progress)
+                loop.call_soon_threadsafe(_enqueue, progress)
             
-            # Send initial event
+            # Pin the client reconnect backoff before any data flows, so
+            # every browser retries after 5s instead of its own default
+            yield {"retry": 5000}
+
+            # Send initial event (precomputed at import time)
             yield {
                 "event": "progress",
-                "data": TranscriptionProgress(
-                    status=TranscriptionStatus.PROCESSING,
-                    progress_percent=0,
-                    current_chunk=0,
-                    total_chunks=1,
-                    message="Starting transcription..."
-                ).model_dump_json()
+                "data": _STARTING_EVENT
             }
             
             # Start transcription as a background task
-            task = asyncio.create_task(whisper.transcribe_bytes(content, progress_callback=on_progress))
+            task = asyncio.create_task(whisper.transcribe_file(temp_path, progress_callback=on_progress))
             
-            # Process queue while task is running
-            while not task.done():
-                try:
-                    # Wait for next progress update or timeout to check task status
-                    progress_data = await asyncio.wait_for(queue.get(), timeout=0.1)
-                    
-                    # Convert dataclass to Pydantic model
-                    progress_model = TranscriptionProgress(
-                        status=TranscriptionStatus.PROCESSING,
-                        progress_percent=progress_data.progress_percent,
-                        current_chunk=progress_data.current_chunk,
-                        total_chunks=progress_data.total_chunks,
-                        message=progress_data.message,
-                        partial_text=progress_data.partial_text
-                    )
-                    
-                    yield {
-                        "event": "progress",
-                        "data": progress_model.model_dump_json()
-                    }
-                except asyncio.TimeoutError:
-                    continue
-            
-            # Drain any remaining items in queue
-            while not queue.empty():
-                progress_data = queue.get_nowait()
-                
-                progress_model = TranscriptionProgress(
-                    status=TranscriptionStatus.PROCESSING,
-                    progress_percent=progress_data.progress_percent,
-                    current_chunk=progress_data.current_chunk,
-                    total_chunks=progress_data.total_chunks,
-                    message=progress_data.message,
-                    partial_text=progress_data.partial_text
+            # Throttle emission: fast transcriptions can fire many callbacks
+            # per second, and each frame costs an encode + a network write
+            MIN_EMIT_INTERVAL = 0.2  # seconds between progress frames
+            last_emit = 0.0
+
+            # Comment keepalives stop NAT boxes and proxies from dropping the
+            # connection during long silent stretches (big chunks, slow GPU),
+            # which would otherwise trigger a client reconnect mid-transcription
+            KEEPALIVE_INTERVAL = 15.0  # seconds of silence before a ping
+
+            # Race the queue against task completion instead of polling
+            # task.done() every 100ms — an idle connection now wakes up only
+            # once per keepalive interval instead of 10x/s.
+            get_t = asyncio.create_task(queue.get())
+            while True:
+                if task.done() and queue.empty() and not get_t.done():
+                    get_t.cancel()
+                    break
+
+                done, _ = await asyncio.wait(
+                    {get_t, task},
+                    timeout=KEEPALIVE_INTERVAL,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-                
+                if not done:
+                    yield {"comment": "ping"}
+                    continue
+                if get_t not in done:
+                    continue  # task finished; exit check at the top handles it
+
+                progress_data = get_t.result()
+
+                # Coalesce bursts: only the newest queued update matters
+                while True:
+                    try:
+                        progress_data = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                get_t = asyncio.create_task(queue.get())
+
+                wait = MIN_EMIT_INTERVAL - (loop.time() - last_emit)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                last_emit = loop.time()
+
                 yield {
                     "event": "progress",
-                    "data": progress_model.model_dump_json()
+                    "data": _progress_event(
+                        progress_data.progress_percent,
+                        progress_data.current_chunk,
+                        progress_data.total_chunks,
+                        progress_data.message,
+                        progress_data.partial_text,
+                    )
                 }
 
             # Get the result (this will raise if task failed)
             result = await task
             
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
+            processing_time = time.monotonic() - t0
             
             # Send completion event
             yield {
@@ -228,7 +421,7 @@ async def transcribe_audio_stream(
                     duration_seconds=result.duration_seconds,
                     word_count=result.word_count,
                     processing_time_seconds=processing_time,
-                    created_at=start_time,
+                    created_at=created_at,
                 ).model_dump_json()
             }
             
@@ -238,12 +431,15 @@ async def transcribe_audio_stream(
                 "data": "Transcription service not available. ML dependencies may not be installed."
             }
         except Exception as e:
-            logger.error(f"Streaming transcription failed: {e}")
+            logger.error("Streaming transcription failed: %s", e)
             yield {
                 "event": "error",
                 "data": f"Transcription failed: {str(e)}"
             }
-    
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
     return EventSourceResponse(generate_events())
 
 
@@ -273,9 +469,10 @@ async def save_recording(
     """
     try:
         # Generate unique ID for this recording
-        recording_id = str(uuid.uuid4())
+        recording_id = uuid.uuid4().hex
         
         # Ensure recordings directory exists
+        settings = get_settings()
         recordings_path = Path(settings.recordings_dir)
         recordings_path.mkdir(parents=True, exist_ok=True)
         
@@ -283,7 +480,7 @@ async def save_recording(
         ext = ".webm"
         if file.filename:
             file_ext = Path(file.filename).suffix.lower()
-            if file_ext in settings.allowed_extensions_list:
+            if file_ext in settings.allowed_extensions_set:
                 ext = file_ext
         
         # Create timestamp and format duration (using local time)
@@ -298,13 +495,27 @@ async def save_recording(
         filename = f"thale_{timestamp}____{duration_str}__{recording_id[:8]}{ext}"
         file_path = recordings_path / filename
         
-        # Save file
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        file_size_mb = len(content) / (1024 * 1024)
-        logger.info(f"💾 Saved recording: {filename} ({file_size_mb:.2f} MB)")
+        # The multipart body is fully parsed by now, so copy the spooled
+        # upload straight to the destination on a worker thread — neither the
+        # recording nor the disk write ever touches the event loop or RAM
+        try:
+            total_bytes = await asyncio.get_running_loop().run_in_executor(
+                IO_EXECUTOR,
+                _copy_validated_audio,
+                file.file,
+                file_path,
+                settings.max_upload_size_bytes,
+                settings.max_upload_size_mb,
+            )
+        except Exception:
+            if file_path.exists():
+                os.unlink(file_path)
+            raise
+
+        _index_recording(recordings_path, recording_id, filename)
+
+        file_size_mb = total_bytes / (1024 * 1024)
+        logger.info("💾 Saved recording: %s (%.2f MB)", filename, file_size_mb)
         
         return {
             "recording_id": recording_id,
@@ -312,8 +523,10 @@ async def save_recording(
             "size_mb": round(file_size_mb, 2)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Failed to save recording: {e}")
+        logger.error("Failed to save recording: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to save recording: {str(e)}"
@@ -321,42 +534,49 @@ async def save_recording(
 
 
 @router.get("/recording/{recording_id}")
-async def get_recording(recording_id: str):
+async def get_recording(recording_id: str, request: Request):
     """
     Retrieve a saved audio recording by ID.
     
     Returns the audio file for playback or transcription.
     """
     try:
+        settings = get_settings()
         recordings_path = Path(settings.recordings_dir)
-        
-        # Search for file containing the recording ID (handles both old UUID-only and new timestamped formats)
+
+        # O(1) lookup via the index; fall through to the legacy scans below
+        # for recordings saved before the index existed
+        filename = _load_recording_index(recordings_path).get(recording_id)
+        if filename:
+            file_path = recordings_path / filename
+            try:
+                # Single stat on the known filename; no directory scan
+                response = _recording_response(request, file_path)
+            except FileNotFoundError:
+                pass  # index is stale; fall through to the legacy scans
+            else:
+                logger.info("📁 Retrieved recording: %s", file_path.name)
+                return response
+
+        # Legacy: search for file containing the recording ID (handles both old UUID-only and new timestamped formats)
         for file_path in recordings_path.glob(f"*{recording_id[:8]}*"):
             if file_path.is_file():
-                logger.info(f"📁 Retrieved recording: {file_path.name}")
-                return FileResponse(
-                    path=str(file_path),
-                    media_type="audio/webm",
-                    filename=file_path.name
-                )
-        
+                logger.info("📁 Retrieved recording: %s", file_path.name)
+                return _recording_response(request, file_path)
+
         # Fallback: try old format with full UUID
-        for ext in settings.allowed_extensions_list:
+        for ext in settings.allowed_extensions_set:
             file_path = recordings_path / f"{recording_id}{ext}"
             if file_path.exists():
-                logger.info(f"📁 Retrieved recording: {recording_id}{ext}")
-                return FileResponse(
-                    path=str(file_path),
-                    media_type="audio/webm",
-                    filename=f"recording{ext}"
-                )
+                logger.info("📁 Retrieved recording: %s%s", recording_id, ext)
+                return _recording_response(request, file_path, download_name=f"recording{ext}")
         
         raise HTTPException(status_code=404, detail="Recording not found")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to retrieve recording: {e}")
+        logger.error("Failed to retrieve recording: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve recording: {str(e)}"
@@ -371,36 +591,52 @@ async def delete_recording(recording_id: str):
     Permanently removes the recording file from storage.
     """
     try:
+        settings = get_settings()
         recordings_path = Path(settings.recordings_dir)
         deleted = False
-        
-        # Search for file containing the recording ID (handles both old and new formats)
-        for file_path in recordings_path.glob(f"*{recording_id[:8]}*"):
-            if file_path.is_file():
-                os.remove(file_path)
+
+        # O(1) lookup via the index; legacy scans below cover pre-index files
+        filename = _load_recording_index(recordings_path).get(recording_id)
+        if filename:
+            try:
+                # Remove directly instead of stat-then-remove; a stale index
+                # entry just falls through to the legacy scans
+                os.remove(recordings_path / filename)
                 deleted = True
-                logger.info(f"🗑️  Deleted recording: {file_path.name}")
-                break
-        
+                logger.info("🗑️  Deleted recording: %s", filename)
+            except FileNotFoundError:
+                pass
+
+        # Legacy: search for file containing the recording ID (handles both old and new formats)
+        if not deleted:
+            for file_path in recordings_path.glob(f"*{recording_id[:8]}*"):
+                if file_path.is_file():
+                    os.remove(file_path)
+                    deleted = True
+                    logger.info("🗑️  Deleted recording: %s", file_path.name)
+                    break
+
         # Fallback: try old format with full UUID
         if not deleted:
-            for ext in settings.allowed_extensions_list:
+            for ext in settings.allowed_extensions_set:
                 file_path = recordings_path / f"{recording_id}{ext}"
                 if file_path.exists():
                     os.remove(file_path)
                     deleted = True
-                    logger.info(f"🗑️  Deleted recording: {recording_id}{ext}")
+                    logger.info("🗑️  Deleted recording: %s%s", recording_id, ext)
                     break
         
         if not deleted:
             raise HTTPException(status_code=404, detail="Recording not found")
-        
+
+        _index_recording(recordings_path, recording_id, None)
+
         return {"message": "Recording deleted successfully", "recording_id": recording_id}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete recording: {e}")
+        logger.error("Failed to delete recording: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to delete recording: {str(e)}"
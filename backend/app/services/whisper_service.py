@@ -48,21 +48,28 @@ class WhisperService:
     Service for transcribing audio using NB-Whisper (Norwegian Whisper model).
     Handles long audio files by processing in chunks.
     """
-    
+
+    # RMS floor below which a chunk is treated as silence and skipped
+    SILENCE_RMS = 1e-4
+
+
     def __init__(
         self,
         model_id: str = "NbAiLab/nb-whisper-large",
         language: str = "no",
         chunk_length_s: int = 30,
+        batch_size: int = 8,
     ):
         self.model_id = model_id
         self.language = language
         self.chunk_length_s = chunk_length_s
+        self.batch_size = batch_size
         self.sample_rate = 16000
         
         self._model = None
         self._processor = None
         self._device = None
+        self._dtype = None
         self._is_loaded = False
     
     @property
@@ -97,15 +104,20 @@ class WhisperService:
             import huggingface_hub
             huggingface_hub.utils.logging.set_verbosity_error()
             
-            logger.info(f"🔊 Loading Whisper model: {self.model_id}")
-            
-            # Setup device (GPU if available, otherwise CPU)
-            self._device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            logger.info(f"🖥️  Using device: {self._device}")
+            logger.info("🔊 Loading Whisper model: %s", self.model_id)
             
+            # Setup device (GPU if available, otherwise CPU). On GPU, load the
+            # weights in FP16: inference is compute-bound and half precision
+            # roughly doubles tensor-core throughput for negligible WER change.
             if torch.cuda.is_available():
-                logger.info(f"   GPU: {torch.cuda.get_device_name(0)}")
-            
+                self._device = torch.device("cuda")
+                self._dtype = torch.float16
+                logger.info("   GPU: %s", torch.cuda.get_device_name(0))
+            else:
+                self._device = torch.device("cpu")
+                self._dtype = torch.float32
+            logger.info("🖥️  Using device: %s (%s)", self._device, self._dtype)
+
             # Load model and processor with reduced retry attempts
             self._processor = WhisperProcessor.from_pretrained(
                 self.model_id,
@@ -115,8 +127,41 @@ class WhisperService:
             self._model = WhisperForConditionalGeneration.from_pretrained(
                 self.model_id,
                 local_files_only=False,
-                resume_download=True
+                resume_download=True,
+                torch_dtype=self._dtype,
+                # PyTorch's fused scaled-dot-product attention kernels
+                attn_implementation="sdpa",
             ).to(self._device)
+
+            # Pure-inference service: switch off dropout/batchnorm training
+            # behavior and detach autograd bookkeeping from every parameter
+            self._model.eval()
+            self._model.requires_grad_(False)
+
+            # Compile the forward pass on GPU: every chunk produces the same
+            # [B, 80, 3000] mel shape, so the compiled graphs are reused across
+            # generate calls instead of paying eager dispatch each time. The
+            # static KV cache gives the decoder steps stable shapes too.
+            if self._device.type == "cuda":
+                try:
+                    self._model.generation_config.cache_implementation = "static"
+                    self._model.forward = torch.compile(
+                        self._model.forward, mode="reduce-overhead", fullgraph=False
+                    )
+                    logger.info("   torch.compile enabled (static KV cache)")
+                except Exception as e:
+                    logger.warning("torch.compile unavailable, running eager: %s", e)
+            else:
+                # CPU fallback: dynamically quantize the Linear layers to
+                # int8. FP32 matmuls dominate CPU inference time; int8 roughly
+                # halves it (and memory) for a negligible WER change.
+                try:
+                    self._model = torch.quantization.quantize_dynamic(
+                        self._model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    logger.info("   int8 dynamic quantization enabled (CPU)")
+                except Exception as e:
+                    logger.warning("int8 quantization unavailable, running FP32: %s", e)
             
             self._is_loaded = True
             logger.info("✅ Whisper model loaded successfully")
@@ -130,7 +175,7 @@ class WhisperService:
                 logger.error("❌ Failed to load Whisper model: Network connection error")
                 logger.error("   Cannot reach HuggingFace. Live transcription will be unavailable.")
             else:
-                logger.error(f"❌ Failed to load Whisper model: {error_msg}")
+                logger.error("❌ Failed to load Whisper model: %s", error_msg)
             
             self._is_loaded = False
             # Don't re-raise - let the app start but disable transcription features
@@ -154,6 +199,13 @@ class WhisperService:
     def _format_time(self, seconds: float) -> str:
         """Format seconds as HH:MM:SS."""
         return str(timedelta(seconds=int(seconds)))
+
+    def _resample(self, waveform_np: np.ndarray, orig_sr: int) -> np.ndarray:
+        """Resample a mono waveform to self.sample_rate via torchaudio."""
+        import torch
+        import torchaudio.functional as AF
+        waveform = torch.from_numpy(np.ascontiguousarray(waveform_np, dtype=np.float32))
+        return AF.resample(waveform, orig_sr, self.sample_rate).numpy()
     
     async def transcribe_file(
         self,
@@ -170,9 +222,8 @@ class WhisperService:
         Returns:
             TranscriptionResult with the full transcription
         """
-        import torch
-        import librosa
-        
+        import soundfile as sf
+
         # Ensure model is loaded
         if not self._is_loaded:
             self.load_model()
@@ -189,13 +240,25 @@ class WhisperService:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {file_path}")
         
-        logger.info(f"📁 Transcribing: {audio_path}")
+        logger.info("📁 Transcribing: %s", audio_path)
         
-        # Load audio
-        waveform_np, sr = librosa.load(str(audio_path), sr=self.sample_rate, mono=True)
-        duration = len(waveform_np) / sr
+        # Load audio. soundfile reads WAV/FLAC/OGG natively and torchaudio
+        # resamples with a compiled polyphase kernel — librosa's
+        # audioread+resampy path is kept only as the fallback for containers
+        # soundfile can't open (m4a/webm), since it is an order of magnitude
+        # slower and imports on first use.
+        try:
+            waveform_np, sr = sf.read(str(audio_path), dtype="float32", always_2d=False)
+            if waveform_np.ndim > 1:
+                waveform_np = waveform_np.mean(axis=1)
+            if sr != self.sample_rate:
+                waveform_np = self._resample(waveform_np, sr)
+        except (RuntimeError, sf.LibsndfileError):
+            import librosa
+            waveform_np, sr = librosa.load(str(audio_path), sr=self.sample_rate, mono=True)
+        duration = len(waveform_np) / self.sample_rate
         
-        logger.info(f"   Duration: {self._format_time(duration)} ({duration:.1f}s)")
+        logger.info("   Duration: %s (%.1fs)", self._format_time(duration), duration)
         
         # Process chunks
         result = await self._transcribe_waveform(
@@ -221,7 +284,6 @@ class WhisperService:
         Returns:
             TranscriptionResult with the full transcription
         """
-        import librosa
         import soundfile as sf
         import io
         
@@ -241,10 +303,11 @@ class WhisperService:
             
             # Resample if needed
             if sr != self.sample_rate:
-                waveform_np = librosa.resample(waveform_np, orig_sr=sr, target_sr=self.sample_rate)
+                waveform_np = self._resample(waveform_np, sr)
                 
         except Exception:
             # Fall back to librosa (handles more formats but slower)
+            import librosa
             import tempfile
             with tempfile.NamedTemporaryFile(suffix='.audio', delete=False) as tmp:
                 tmp.write(audio_bytes)
@@ -256,7 +319,7 @@ class WhisperService:
                 os.unlink(tmp_path)
         
         duration = len(waveform_np) / self.sample_rate
-        logger.info(f"📁 Transcribing audio: {duration:.1f}s")
+        logger.info("📁 Transcribing audio: %.1fs", duration)
         
         result = await self._transcribe_waveform(
             waveform_np,
@@ -266,6 +329,40 @@ class WhisperService:
         
         return result
     
+    async def transcribe_array(
+        self,
+        waveform_np: np.ndarray,
+        progress_callback: Optional[Callable[[TranscriptionProgress], None]] = None,
+    ) -> TranscriptionResult:
+        """
+        Transcribe a waveform that is already decoded to 16 kHz mono float32
+        (e.g. the live-streaming PCM buffer). Skips the librosa/soundfile load.
+
+        Args:
+            waveform_np: Raw waveform samples at self.sample_rate
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            TranscriptionResult with the full transcription
+        """
+        # Ensure model is loaded
+        if not self._is_loaded:
+            self.load_model()
+
+            if not self._is_loaded:
+                raise RuntimeError(
+                    "Whisper-modellen er ikke tilgjengelig. "
+                    "Sjå server-logger for detaljer."
+                )
+
+        duration = len(waveform_np) / self.sample_rate
+
+        return await self._transcribe_waveform(
+            waveform_np,
+            duration,
+            progress_callback
+        )
+
     async def _transcribe_waveform(
         self,
         waveform_np: np.ndarray,
@@ -275,55 +372,87 @@ class WhisperService:
         """
         Internal method to transcribe a numpy waveform array.
         """
-        import torch
-        
         # Calculate chunks
         chunk_samples = self.chunk_length_s * self.sample_rate
         num_chunks = int(np.ceil(len(waveform_np) / chunk_samples))
-        
-        logger.info(f"   Processing in {num_chunks} chunks of {self.chunk_length_s}s each")
-        
+
+        logger.info("   Processing in %d chunks of %ds each", num_chunks, self.chunk_length_s)
+
+        # Pre-slice all chunks (views into the waveform, no copies), then run
+        # them through the model in mini-batches: one forward pass per batch
+        # amortizes the per-call dispatch and kernel-launch overhead that
+        # dominates batch-of-1 generate calls on GPU.
+        chunks = [
+            waveform_np[i * chunk_samples:(i + 1) * chunk_samples]
+            for i in range(num_chunks)
+        ]
+
+        # Silence gate: chunks whose RMS sits at the noise floor (pauses,
+        # pre-meeting dead air) would still cost a full forward pass each.
+        # The threshold is ~1/10,000th of full scale, so even very quiet
+        # speech passes; only genuine silence is skipped.
+        voiced = [
+            (i, chunk) for i, chunk in enumerate(chunks)
+            if np.sqrt(np.mean(np.square(chunk, dtype=np.float64))) > self.SILENCE_RMS
+        ]
+        if len(voiced) < num_chunks:
+            logger.info("   Skipping %d silent chunk(s) of %d", num_chunks - len(voiced), num_chunks)
+
+        batches = [
+            voiced[i:i + self.batch_size]
+            for i in range(0, len(voiced), self.batch_size)
+        ]
+
         all_transcriptions = []
-        
-        for i in range(num_chunks):
-            # Extract chunk
-            start_sample = i * chunk_samples
-            end_sample = min((i + 1) * chunk_samples, len(waveform_np))
-            chunk = waveform_np[start_sample:end_sample]
-            
-            # Progress update
-            progress = (i + 1) / num_chunks * 100
-            start_time = start_sample / self.sample_rate
-            end_time = end_sample / self.sample_rate
-            
+        loop = asyncio.get_event_loop()
+
+        # Pipeline the two stages: while the GPU runs generate on batch i, a
+        # CPU worker already extracts mel features for batch i+1, so
+        # preprocessing and the host-to-device copy hide behind compute.
+        features_task = None
+        if batches:
+            features_task = loop.run_in_executor(
+                None, self._extract_features, [c for _, c in batches[0]]
+            )
+
+        processed = 0
+        for bi, batch in enumerate(batches):
+            processed += len(batch)
+
+            # Progress update (per mini-batch); times come from the original
+            # chunk positions so the message reflects the audio timeline even
+            # when silent chunks were skipped.
+            progress = processed / len(voiced) * 100
+            start_time = batch[0][0] * self.chunk_length_s
+            end_time = min((batch[-1][0] + 1) * chunk_samples, len(waveform_np)) / self.sample_rate
+
             if progress_callback:
                 progress_callback(TranscriptionProgress(
-                    current_chunk=i + 1,
-                    total_chunks=num_chunks,
+                    current_chunk=processed,
+                    total_chunks=len(voiced),
                     progress_percent=progress,
                     message=f"Processing {self._format_time(start_time)} - {self._format_time(end_time)}",
                     partial_text=" ".join(all_transcriptions),
                 ))
-            
-            # Log progress to terminal every 10 chunks or 10%
-            if (i + 1) % 10 == 0 or (i + 1) == num_chunks:
-                logger.info(f"   ⏳ Progress: {i + 1}/{num_chunks} chunks ({progress:.1f}%)")
-            
-            # Transcribe chunk (run in thread pool to not block async)
-            transcription = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self._transcribe_chunk,
-                chunk
-            )
-            
-            if transcription.strip():
-                all_transcriptions.append(transcription.strip())
-        
+
+            logger.info("   ⏳ Progress: %d/%d chunks (%.1f%%)", processed, len(voiced), progress)
+
+            features = await features_task
+            if bi + 1 < len(batches):
+                features_task = loop.run_in_executor(
+                    None, self._extract_features, [c for _, c in batches[bi + 1]]
+                )
+
+            # Run generate in the thread pool to not block async
+            transcriptions = await loop.run_in_executor(None, self._generate_batch, features)
+
+            all_transcriptions.extend(t.strip() for t in transcriptions if t.strip())
+
         # Combine all transcriptions
         full_text = " ".join(all_transcriptions)
         word_count = len(full_text.split())
         
-        logger.info(f"✅ Transcription complete: {word_count} words")
+        logger.info("✅ Transcription complete: %d words", word_count)
         
         return TranscriptionResult(
             text=full_text,
@@ -332,35 +461,44 @@ class WhisperService:
             chunks_processed=num_chunks,
         )
     
-    def _transcribe_chunk(self, chunk: np.ndarray) -> str:
+    def _extract_features(self, chunks: list):
         """
-        Transcribe a single audio chunk (synchronous, called in executor).
+        Run the mel feature extractor for a mini-batch on CPU
+        (synchronous, called in executor).
+
+        The feature extractor takes the numpy chunks directly and pads them
+        to the model's fixed mel length, giving one [B, 80, 3000] tensor.
         """
-        import torch
-        
-        # Convert to tensor
-        chunk_tensor = torch.tensor(chunk, dtype=torch.float32).unsqueeze(0).to(self._device)
-        
-        # Preprocess
         inputs = self._processor(
-            chunk_tensor.squeeze().cpu().numpy(),
+            chunks,
             sampling_rate=self.sample_rate,
-            return_tensors="pt"
+            return_tensors="pt",
+            padding=True,
         )
-        inputs = {k: v.to(self._device) for k, v in inputs.items()}
-        
-        # Generate transcription
-        with torch.no_grad():
+        features = inputs["input_features"]
+        if self._device.type == "cuda":
+            features = features.pin_memory()  # allows the H2D copy to be async
+        return features
+
+    def _generate_batch(self, features) -> list:
+        """
+        Transcribe one mini-batch of pre-extracted features in a single
+        forward pass (synchronous, called in executor).
+        """
+        import torch
+
+        input_features = features.to(self._device, dtype=self._dtype, non_blocking=True)
+
+        # Generate transcriptions for the whole batch at once
+        with torch.inference_mode():
             predicted_ids = self._model.generate(
-                inputs["input_features"],
+                input_features,
                 language=self.language,
                 task="transcribe"
             )
-        
+
         # Decode
-        transcription = self._processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
-        
-        return transcription
+        return self._processor.batch_decode(predicted_ids, skip_special_tokens=True)
 
 
 # Singleton instance for the app
@@ -377,5 +515,6 @@ def get_whisper_service() -> WhisperService:
             model_id=settings.whisper_model_id,
             language=settings.whisper_language,
             chunk_length_s=settings.whisper_chunk_length_s,
+            batch_size=settings.whisper_batch_size,
         )
     return _whisper_service